@@ -3,15 +3,17 @@
 Transcriber Console Application
 --------------------------------
 A versatile terminal-based Python script to transcribe audio or video files 
-into text using OpenAI Whisper models. It supports various model sizes 
-(tiny, base, small, medium), automatic audio extraction from video (via ffmpeg),
-and convenient language selection for both English and Russian.
+into text using OpenAI Whisper models served by faster-whisper (CTranslate2).
+It supports various model sizes (tiny, base, small, medium), automatic audio
+extraction from video (via ffmpeg), and convenient language selection for
+both English and Russian.
 
 Requirements:
     - Python 3.7+ 
     - ffmpeg (system-wide installation)
     - Torch 
-    - Whisper 
+    - faster-whisper 
+    - NumPy 
     - (Optional) Rich for colored console output
 
 Usage Examples:
@@ -21,92 +23,1527 @@ Usage Examples:
     2) Transcribe an MP4 video file, specifying an output text file and Russian language:
        $ python transcriber.py /path/to/video.mp4 --output result.txt --lang rus
 
-    3) Select a specific Whisper model (e.g., 'medium'):
+    3) Transcribe several files with one model load, one .txt per input:
+       $ python transcriber.py /path/to/*.mp3 --output transcripts/
+
+    4) Select a specific Whisper model (e.g., 'medium'):
        $ python transcriber.py /path/to/audio.mp3 --model medium
 
+    5) Use a TensorRT-LLM engine on an NVIDIA GPU:
+       $ python transcriber.py /path/to/audio.mp3 --backend trt
+
 Background:
     - OpenAI Whisper is a general-purpose speech recognition model. 
+    - faster-whisper reimplements Whisper on top of CTranslate2, which runs the 
+      same weights with fused kernels and float16/int8 compute, typically 
+      several times faster than the reference PyTorch implementation. 
+    - The reference PyTorch implementation (openai-whisper), prebuilt 
+      TensorRT-LLM engines and exported ONNX models (ONNX Runtime) are 
+      available as alternative backends. 
     - This script demonstrates how to preprocess input (video/audio), load the 
       chosen Whisper model, and then output transcribed text in an accessible 
       format. 
 """
 
 import argparse
+import contextlib
+import functools
+import gc
+import glob
+import hashlib
+import io
+import json
 import os
+import queue
+import re
+import shutil
+import socket
+import stat
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple
 
-try:
-    import torch
-except ImportError:
-    print("[ERROR] PyTorch is required but not installed. Please install it via 'pip install torch'.")
-    sys.exit(1)
+# Persist torch.compile (Inductor) artifacts across runs; must be set before importing torch
+os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", os.path.expanduser("~/.cache/whisper_inductor"))
+os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
 
 try:
-    import whisper
+    import numpy as np
 except ImportError:
-    print("[ERROR] Whisper is required but not installed. Please install it via 'pip install whisper'.")
+    print("[ERROR] NumPy is required but not installed. Please install it via 'pip install numpy'.")
     sys.exit(1)
 
+# PyTorch and faster-whisper take seconds to import; see import_dependencies
+# and import_faster_whisper
+torch = None
+ctranslate2 = None
+WhisperModel = None
+
 
-# Suppress future warnings from PyTorch/Whisper
+# Suppress future warnings from PyTorch/faster-whisper
 warnings.filterwarnings("ignore", category=FutureWarning)
 
+# Prebuilt TensorRT-LLM engines, one directory per (model, GPU, precision)
+TRT_CACHE_DIR = os.path.expanduser("~/.cache/whisper-trt")
+
+# fp16 safetensors copies of the reference checkpoints, written by --prepack
+PREPACK_CACHE_DIR = os.path.expanduser("~/.cache/whisper-prepacked")
+
+# Exported ONNX encoder/decoder pairs, one directory per model
+ORT_CACHE_DIR = os.path.expanduser("~/.cache/whisper-onnx")
+
+# Decoded audio, keyed by file identity and content hash. On disk rather than
+# tmpfs, so the cache neither takes RAM nor fills a small /dev/shm; entries are
+# skipped when less than AUDIO_CACHE_MIN_FREE_BYTES would remain free
+AUDIO_CACHE_DIR = os.path.expanduser("~/.cache/whisper-audio")
+AUDIO_CACHE_MAX_BYTES = 1 << 30
+AUDIO_CACHE_MIN_FREE_BYTES = 1 << 30
+
+# Input formats; ffmpeg decodes all of them, video files via their audio track
+AUDIO_EXTS = frozenset({".mp3", ".m4a", ".wav", ".flac", ".ogg"})
+VIDEO_EXTS = frozenset({".mp4", ".mkv", ".mov", ".webm"})
+SUPPORTED_FORMATS = sorted(ext[1:] for ext in AUDIO_EXTS | VIDEO_EXTS)
+
+# Whisper always consumes 30-second windows of 16 kHz audio
+SAMPLE_RATE = 16000
+CHUNK_SAMPLES = 30 * SAMPLE_RATE
+
+# Windows are cut at the quietest 20 ms frame of their last 5 seconds, so a
+# word crossing the 30-second mark is not split between two windows
+PAUSE_SEARCH_SAMPLES = 5 * SAMPLE_RATE
+PAUSE_FRAME_SAMPLES = SAMPLE_RATE // 50
+
+# Pauses at least this long are cut out by voice activity detection
+VAD_MIN_SILENCE_MS = 500
+
+# Models kept loaded per device by get_cached_model
+MODEL_CACHE_SIZE = {"cuda": 1, "cpu": 2}
+
+# CPU threads per faster-whisper model; 0 lets CTranslate2 decide. CPU workers
+# (see transcription_worker) set their share of the cores
+CPU_THREADS = 0
 
-def extract_audio(video_path: str, audio_path: str) -> None:
+# Background model server: how long to wait for it to start, and how long it
+# stays alive without requests before releasing the models
+DAEMON_START_TIMEOUT = 30
+DAEMON_IDLE_TIMEOUT = 15 * 60
+
+
+class TranscriptionError(Exception):
     """
-    Extracts audio from a given video file and saves it as a WAV file with 
-    the specified audio path. Uses ffmpeg via subprocess to convert the file.
+    A fatal error with a message meant for the user. Raised instead of calling 
+    sys.exit by helpers that also run in the model server, so the server can 
+    send the message back to the client and keep running.
+    """
+
 
-    :param video_path: Path to the input video file (e.g., .mp4)
-    :param audio_path: Path to the temporary audio file (e.g., temp_audio.wav)
+def import_dependencies() -> None:
     """
+    Imports PyTorch. It takes seconds to import, so this runs only once the 
+    arguments are parsed and validated, and only in the process that loads 
+    models; --help, argument errors and clients of the model server never pay 
+    for it.
+    """
+    global torch
     try:
-        command = [
-            "ffmpeg", "-i", video_path, "-vn", 
-            "-ar", "16000", "-ac", "1", "-c:a", "pcm_s16le", 
-            audio_path
-        ]
-        subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        import torch
+    except ImportError:
+        print("[ERROR] PyTorch is required but not installed. Please install it via 'pip install torch'.")
+        sys.exit(1)
+
+
+def import_faster_whisper() -> None:
+    """
+    Imports faster-whisper and CTranslate2, only once the faster-whisper 
+    backend is actually loaded (directly or as the ONNX Runtime fallback), so 
+    --prepack and the other backends work without them.
+
+    :raises TranscriptionError: If faster-whisper is not installed.
+    """
+    global ctranslate2, WhisperModel
+    try:
+        import ctranslate2
+        from faster_whisper import WhisperModel
+    except ImportError:
+        raise TranscriptionError(
+            "faster-whisper is required for this backend. Please install it via 'pip install faster-whisper'."
+        )
+
+
+def resolve_device(device: Optional[str]) -> str:
+    """
+    Returns the forced device, or auto-detects a GPU.
+
+    :param device: 'cpu', 'cuda', or None to auto-detect.
+    :return: 'cuda' if forced or a GPU is available, otherwise 'cpu'.
+    """
+    if device is not None:
+        return device
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def ensure_private_dir(path: str) -> str:
+    """
+    Creates a directory that only the current user can access, or checks that 
+    the existing one is. In shared locations such as /tmp, another 
+    user could have created the path first to read or plant files.
+
+    :param path: Directory path.
+    :return: The same path.
+    :raises PermissionError: If the path is not a directory owned by the current user with mode 0700.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"'{path}' is not a directory.")
+    # Without POSIX ownership (e.g. on Windows), mode bits say nothing about access
+    if not hasattr(os, "getuid"):
+        return path
+    if info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077:
+        raise PermissionError(f"'{path}' is not a private directory owned by the current user.")
+    return path
+
+
+def audio_cache_path(input_path: str) -> str:
+    """
+    Returns the cache file for the decoded audio of an input file. The key is 
+    a BLAKE2 hash of the file's absolute path, inode, size, modification time 
+    and first megabyte, which takes microseconds even for hour-long videos. 
+    Any edit updates the modification time, so a changed file is never served 
+    stale audio, even when its size and first megabyte stay the same.
+
+    :param input_path: Path to the input file.
+    :return: Path to the cached raw PCM file (may not exist yet).
+    :raises PermissionError: If the cache directory exists but is not private.
+    """
+    ensure_private_dir(AUDIO_CACHE_DIR)
+    info = os.stat(input_path)
+    identity = f"{os.path.abspath(input_path)}\0{info.st_ino}\0{info.st_size}\0{info.st_mtime_ns}"
+    digest = hashlib.blake2b(identity.encode("utf-8", errors="surrogateescape"))
+    with open(input_path, "rb") as f:
+        digest.update(f.read(1 << 20))
+    return os.path.join(AUDIO_CACHE_DIR, digest.hexdigest()[:16] + ".pcm")
+
+
+def store_cached_audio(cache_path: str, pcm: bytes) -> None:
+    """
+    Stores decoded PCM in the audio cache, evicting the least recently used 
+    entries to stay under AUDIO_CACHE_MAX_BYTES.
+
+    :param cache_path: Path returned by audio_cache_path.
+    :param pcm: Raw 16 kHz mono s16le samples.
+    :raises OSError: If the entry cannot be written, e.g. for lack of free space.
+    """
+    if len(pcm) > AUDIO_CACHE_MAX_BYTES:
+        return
+    ensure_private_dir(AUDIO_CACHE_DIR)
+
+    entries = sorted(
+        (os.path.join(AUDIO_CACHE_DIR, name) for name in os.listdir(AUDIO_CACHE_DIR)),
+        key=os.path.getmtime
+    )
+    total = sum(os.path.getsize(entry) for entry in entries) + len(pcm)
+    for entry in entries:
+        if total <= AUDIO_CACHE_MAX_BYTES:
+            break
+        total -= os.path.getsize(entry)
+        os.remove(entry)
+
+    if shutil.disk_usage(AUDIO_CACHE_DIR).free < len(pcm) + AUDIO_CACHE_MIN_FREE_BYTES:
+        raise OSError(f"not enough free space in '{AUDIO_CACHE_DIR}'")
+
+    # Write under a temporary name so concurrent readers never see a partial file
+    partial_path = f"{cache_path}.{os.getpid()}.partial"
+    try:
+        with open(partial_path, "wb") as f:
+            f.write(pcm)
+        os.replace(partial_path, cache_path)
+    except OSError:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+
+def stream_audio(input_path: str) -> Iterator[np.ndarray]:
+    """
+    Decodes the audio track of an audio or video file into 16 kHz mono PCM 
+    and yields it in 30-second chunks as soon as ffmpeg produces them, so 
+    transcription of the first chunk overlaps decoding of the rest. Samples 
+    come through a pipe, so no intermediate file is written. The decoded 
+    samples are cached, so transcribing the same file again (e.g. with 
+    another model, or after a failure) skips ffmpeg.
+
+    :param input_path: Path to the input file (e.g., .mp4, .mp3)
+    :return: Float32 waveform chunks in [-1, 1], CHUNK_SAMPLES long except the last.
+    :raises TranscriptionError: If ffmpeg fails to decode the file.
+    """
+    chunk_bytes = CHUNK_SAMPLES * 2
+    try:
+        cache_path = audio_cache_path(input_path)
+    except OSError as e:
+        print(f"[WARNING] Audio cache disabled: {e}")
+        cache_path = None
+    if cache_path is not None and os.path.isfile(cache_path):
+        os.utime(cache_path)
+        with open(cache_path, "rb") as f:
+            for pcm in iter(lambda: f.read(chunk_bytes), b""):
+                yield np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+        return
+
+    # Two decoder threads are plenty for 16 kHz mono and leave the remaining
+    # cores to the model; only errors are logged, and stdin is never read
+    command = [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "2",
+        "-i", input_path, "-vn", 
+        "-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-c:a", "pcm_s16le", 
+        "-"
+    ]
+    # stderr goes to a file: a pipe nobody reads while streaming stdout could
+    # fill up and stall ffmpeg. A stdout buffer of a few chunks' size keeps
+    # read syscalls low.
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(
+            command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=stderr, bufsize=1 << 20
+        )
+        try:
+            # Kept for the cache only while the file still fits in it
+            decoded = [] if cache_path is not None else None
+            decoded_bytes = 0
+            for pcm in iter(lambda: process.stdout.read(chunk_bytes), b""):
+                if decoded is not None:
+                    decoded_bytes += len(pcm)
+                    if decoded_bytes > AUDIO_CACHE_MAX_BYTES:
+                        decoded = None
+                    else:
+                        decoded.append(pcm)
+                yield np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+            process.stdout.close()
+            if process.wait() != 0:
+                stderr.seek(0)
+                error_msg = stderr.read().decode("utf-8", errors="ignore").strip()
+                raise TranscriptionError(f"Failed to extract audio: {error_msg}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+    if decoded is None:
+        return
+    try:
+        store_cached_audio(cache_path, b"".join(decoded))
+    except OSError as e:
+        print(f"[WARNING] Could not cache decoded audio: {e}")
+
+
+def prefetch(chunks: Iterator[np.ndarray], depth: int = 2) -> Iterator[np.ndarray]:
+    """
+    Runs a chunk generator in a background thread, keeping up to `depth` 
+    chunks ready, so ffmpeg decodes ahead while the model transcribes. Errors 
+    in the producer (including sys.exit) are re-raised in the consumer.
+
+    :param chunks: Chunk generator, e.g. from stream_audio.
+    :param depth: Maximum number of chunks buffered ahead.
+    :return: The same chunks, in order.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+            put(done)
+        except BaseException as e:
+            put(e)
+        finally:
+            chunks.close()
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Lets the producer exit (and stop ffmpeg) if the consumer stops early
+        stop.set()
+
+
+def split_at_pauses(chunks: Iterator[np.ndarray]) -> Iterator[np.ndarray]:
+    """
+    Re-cuts fixed 30-second chunks at the quietest point near their end and 
+    carries the rest over to the next window. Chunks are transcribed 
+    independently, so cutting at exact sample boundaries would split (or 
+    drop) any word crossing one.
+
+    :param chunks: Chunk generator, e.g. from stream_audio.
+    :return: Waveform windows of at most CHUNK_SAMPLES, covering the same audio.
+    """
+    pending = np.zeros(0, dtype=np.float32)
+    for chunk in chunks:
+        pending = np.concatenate((pending, chunk))
+        while pending.shape[0] > CHUNK_SAMPLES:
+            # Mean energy of each frame in the search region of the next window
+            tail = pending[CHUNK_SAMPLES - PAUSE_SEARCH_SAMPLES:CHUNK_SAMPLES]
+            energy = np.square(tail.reshape(-1, PAUSE_FRAME_SAMPLES)).mean(axis=1)
+            cut = CHUNK_SAMPLES - PAUSE_SEARCH_SAMPLES + int(np.argmin(energy)) * PAUSE_FRAME_SAMPLES
+            cut += PAUSE_FRAME_SAMPLES // 2
+            yield pending[:cut]
+            pending = pending[cut:]
+    if pending.shape[0]:
+        yield pending
+
+
+def default_compute_type(device: str) -> str:
+    """
+    Picks the default compute type for the given device: int8 on CPU (int8 
+    dot-products move half the bytes of float32), int8_float16 on GPUs with 
+    tensor cores (compute capability 7.0+), and float16 on older GPUs.
+
+    :param device: 'cuda' or 'cpu'.
+    :return: A compute type string accepted by faster-whisper.
+    """
+    if device != "cuda":
+        return "int8"
+    major, _ = torch.cuda.get_device_capability()
+    return "int8_float16" if major >= 7 else "float16"
+
+
+def select_compute_type(device: str, requested: Optional[str] = None) -> str:
+    """
+    Resolves the CTranslate2 compute type for the given device: the requested 
+    one, or the per-device default, falling back to whatever the device 
+    actually supports (e.g. float16 on a CPU without native half precision).
+
+    :param device: 'cuda' or 'cpu'.
+    :param requested: Compute type from --compute-type, or None for the default.
+    :return: A compute type string accepted by faster-whisper.
+    """
+    preferred = requested or default_compute_type(device)
+    supported = ctranslate2.get_supported_compute_types(device)
+    if preferred in supported:
+        return preferred
+    for fallback in ("int8_float16", "float16", "int8", "float32"):
+        if fallback in supported:
+            print(f"[WARNING] Compute type '{preferred}' is not supported on {device}, using '{fallback}'.")
+            return fallback
+    return "default"
+
+
+def import_reference_whisper():
+    """
+    Imports the reference openai-whisper package, which is only needed by the 
+    PyTorch and TensorRT-LLM backends.
+
+    :return: The imported whisper module.
+    :raises TranscriptionError: If openai-whisper is not installed.
+    """
+    try:
+        import whisper
+    except ImportError:
+        raise TranscriptionError(
+            "openai-whisper is required for this backend. Please install it via 'pip install openai-whisper'."
+        )
+    return whisper
+
+
+# Arguments of load_model: (backend, model_size, device, compute_type, compile, quantize, cuda_graph)
+ModelKey = Tuple[str, str, str, Optional[str], bool, str, bool]
+
+
+class LoadedModel(NamedTuple):
+    """A loaded model together with the backend and device it runs on."""
+    backend: str
+    device: str
+    model: Any
+
+
+# Loaded models by load_model arguments, oldest first (see get_cached_model)
+_MODEL_CACHE: "OrderedDict[ModelKey, LoadedModel]" = OrderedDict()
+
+
+def load_faster_whisper(model_size: str, device: str, compute_type: Optional[str] = None) -> Any:
+    """
+    Loads a faster-whisper (CTranslate2) model.
+
+    :param model_size: Model size to load (tiny, base, small, medium).
+    :param device: 'cuda' if GPU is available, otherwise 'cpu'.
+    :param compute_type: Compute type from --compute-type, or None for the per-device default.
+    :return: A faster_whisper.WhisperModel instance.
+    :raises TranscriptionError: If faster-whisper is not installed.
+    """
+    import_faster_whisper()
+    compute_type = select_compute_type(device, compute_type)
+    print(f"[INFO] Loading Whisper model: {model_size} on device: {device} ({compute_type})")
+    return WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=CPU_THREADS)
+
+
+def prepacked_path(model_size: str) -> str:
+    """
+    Returns the path of the prepacked safetensors checkpoint for a model.
+
+    :param model_size: Model size (tiny, base, small, medium).
+    :return: Path to the .safetensors file (may not exist yet).
+    """
+    return os.path.join(PREPACK_CACHE_DIR, f"{model_size}.safetensors")
+
+
+def prepack_model(model_size: str) -> None:
+    """
+    Converts the reference checkpoint into an fp16 safetensors file. Loading 
+    it later memory-maps the weights instead of unpickling them, skips the 
+    extra host copy, and reads half the bytes of an fp32 state_dict.
+
+    :param model_size: Model size to prepack (tiny, base, small, medium).
+    """
+    whisper = import_reference_whisper()
+    try:
+        from safetensors.torch import save_file
+    except ImportError:
+        print("[ERROR] safetensors is required for --prepack. Please install it via 'pip install safetensors'.")
+        sys.exit(1)
+
+    print(f"[INFO] Loading Whisper model: {model_size}")
+    model = whisper.load_model(model_size, device="cpu")
+    state_dict = {name: tensor.to(torch.float16).contiguous() for name, tensor in model.state_dict().items()}
+    metadata = {"dtype": "fp16", "dims": json.dumps(vars(model.dims))}
+
+    path = prepacked_path(model_size)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    save_file(state_dict, path, metadata=metadata)
+    print(f"[INFO] Prepacked model saved to: {path}")
+
+
+def load_prepacked(model_size: str, device: str) -> Optional[Any]:
+    """
+    Loads a model prepacked with --prepack, if there is one.
+
+    :param model_size: Model size to load (tiny, base, small, medium).
+    :param device: 'cuda' if GPU is available, otherwise 'cpu'.
+    :return: A whisper.Whisper instance, or None if no prepacked file (or safetensors) is available.
+    """
+    path = prepacked_path(model_size)
+    if not os.path.isfile(path):
+        return None
+    try:
+        from safetensors import safe_open
+        from safetensors.torch import load_file
+    except ImportError:
+        return None
+
+    whisper = import_reference_whisper()
+    with safe_open(path, framework="pt") as f:
+        dims = whisper.model.ModelDimensions(**json.loads(f.metadata()["dims"]))
+
+    # Build the module directly on the target device, then fill it from the mmapped file
+    with torch.device(device):
+        model = whisper.model.Whisper(dims)
+    model.load_state_dict(load_file(path, device=device), strict=True)
+    return model
+
+
+def quantize_linear_layers(model: Any, quantize: str) -> None:
+    """
+    Replaces the linear layers of the encoder and decoder blocks with 
+    bitsandbytes 8-bit (LLM.int8) or 4-bit (NF4) layers, cutting the VRAM and 
+    memory traffic of the weights by 2-4x. Embeddings, including the token 
+    embedding used for the output logits, stay in full precision.
+
+    :param model: A whisper.Whisper instance on a CUDA device.
+    :param quantize: 'int8' or 'int4'.
+    :raises TranscriptionError: If bitsandbytes is not installed.
+    """
+    try:
+        import bitsandbytes as bnb
+    except ImportError:
+        raise TranscriptionError("bitsandbytes is required for --quantize. Please install it via 'pip install bitsandbytes'.")
+
+    device = next(model.parameters()).device
+    for blocks in (model.encoder.blocks, model.decoder.blocks):
+        for parent in blocks.modules():
+            for name, child in list(parent.named_children()):
+                if not isinstance(child, torch.nn.Linear):
+                    continue
+                weight = child.weight.data.to("cpu", torch.float16)
+                has_bias = child.bias is not None
+                if quantize == "int8":
+                    layer = bnb.nn.Linear8bitLt(
+                        child.in_features, child.out_features, bias=has_bias, has_fp16_weights=False
+                    )
+                    layer.weight = bnb.nn.Int8Params(weight, requires_grad=False, has_fp16_weights=False)
+                else:
+                    layer = bnb.nn.Linear4bit(
+                        child.in_features, child.out_features, bias=has_bias,
+                        compute_dtype=torch.float16, quant_type="nf4"
+                    )
+                    layer.weight = bnb.nn.Params4bit(weight, requires_grad=False, quant_type="nf4")
+                if has_bias:
+                    layer.bias = torch.nn.Parameter(child.bias.data.to("cpu", torch.float16), requires_grad=False)
+                # Weights are quantized when the layer is moved to the GPU
+                setattr(parent, name, layer.to(device))
+    torch.cuda.empty_cache()
+
+
+def capture_encoder_graph(model: Any) -> None:
+    """
+    Captures the audio encoder in a CUDA graph for its fixed input shape, 
+    (1, n_mels, 3000) float16: every 30-second window then replays a single 
+    graph instead of launching each kernel from Python. Inputs of any other 
+    shape or dtype run the encoder eagerly.
+
+    The decoder is left alone: whisper grows its KV cache by concatenation in 
+    forward hooks, so its shapes change every step and cannot be captured.
+
+    :param model: A whisper.Whisper instance on a CUDA device.
+    """
+    whisper = import_reference_whisper()
+    encoder = model.encoder
+    eager_forward = encoder.forward
+    static_input = torch.zeros(1, model.dims.n_mels, whisper.audio.N_FRAMES, device="cuda", dtype=torch.float16)
+
+    # Capture requires a warmup on a side stream first
+    stream = torch.cuda.Stream()
+    stream.wait_stream(torch.cuda.current_stream())
+    with torch.cuda.stream(stream), torch.no_grad():
+        for _ in range(3):
+            eager_forward(static_input)
+    torch.cuda.current_stream().wait_stream(stream)
+
+    graph = torch.cuda.CUDAGraph()
+    with torch.cuda.graph(graph), torch.no_grad():
+        static_output = eager_forward(static_input)
+
+    def graphed_forward(mel: Any) -> Any:
+        if mel.shape != static_input.shape or mel.dtype != static_input.dtype:
+            return eager_forward(mel)
+        static_input.copy_(mel)
+        graph.replay()
+        # The next replay overwrites the output buffer
+        return static_output.clone()
+
+    encoder.forward = graphed_forward
+
+
+def load_pytorch(model_size: str, device: str, compile: bool = False, quantize: str = "none",
+                 cuda_graph: bool = False) -> Any:
+    """
+    Loads the reference PyTorch Whisper model (from the prepacked safetensors 
+    file when available), optionally quantizing its linear layers and 
+    compiling the encoder and decoder with torch.compile. Compilation takes 
+    ~30 s on the first run; the Inductor cache in ~/.cache/whisper_inductor 
+    makes later runs faster.
+
+    :param model_size: Model size to load (tiny, base, small, medium).
+    :param device: 'cuda' if GPU is available, otherwise 'cpu'.
+    :param compile: Whether to compile the encoder and decoder.
+    :param quantize: 'none', 'int8' or 'int4' (CUDA only).
+    :param cuda_graph: Whether to capture the encoder in a CUDA graph (CUDA only).
+    :return: A whisper.Whisper instance.
+    """
+    print(f"[INFO] Loading Whisper model: {model_size} on device: {device}")
+    model = load_prepacked(model_size, device)
+    if model is None:
+        whisper = import_reference_whisper()
+        model = whisper.load_model(model_size, device=device)
+
+    if quantize != "none":
+        if device == "cuda":
+            print(f"[INFO] Quantizing Whisper model to {quantize}...")
+            quantize_linear_layers(model, quantize)
+        else:
+            print("[WARNING] --quantize requires a CUDA device, running unquantized.")
+
+    if compile:
+        # reduce-overhead captures CUDA graphs, which only helps on the GPU. The
+        # decoder's KV-cache hooks cause graph breaks, so it is not compiled fullgraph.
+        mode = "reduce-overhead" if device == "cuda" else "default"
+        print(f"[INFO] Compiling Whisper model ({mode}). The first run includes a warmup...")
+        model.encoder = torch.compile(model.encoder, mode=mode, fullgraph=True)
+        model.decoder = torch.compile(model.decoder, mode=mode)
+
+    if cuda_graph:
+        if device != "cuda":
+            print("[WARNING] --cuda-graph requires a CUDA device, running without it.")
+        elif compile:
+            print("[WARNING] --compile already captures CUDA graphs, ignoring --cuda-graph.")
+        else:
+            print("[INFO] Capturing the encoder in a CUDA graph...")
+            try:
+                capture_encoder_graph(model)
+            except RuntimeError as e:
+                print(f"[WARNING] CUDA graph capture failed, running the encoder eagerly: {e}")
+    return model
+
+
+def trt_engine_dir(model_size: str, precision: str) -> str:
+    """
+    Returns the on-disk cache directory for a TensorRT-LLM engine. Engines are 
+    specific to the GPU they were built on, so the GPU name is part of the key.
+
+    :param model_size: Model size (tiny, base, small, medium).
+    :param precision: Engine precision ('float16' or 'int8').
+    :return: Path to the engine directory (may not exist yet).
+    """
+    gpu_name = re.sub(r"[^A-Za-z0-9]+", "_", torch.cuda.get_device_name(0)).strip("_").lower()
+    return os.path.join(TRT_CACHE_DIR, model_size, f"{gpu_name}-{precision}")
+
+
+def trt_engines_present(engine_dir: str) -> bool:
+    """
+    Checks whether both the encoder and the decoder engines exist in the given 
+    directory.
+
+    :param engine_dir: Engine directory returned by trt_engine_dir.
+    :return: True if both engines are present.
+    """
+    engines = glob.glob(os.path.join(engine_dir, "**", "*.engine"), recursive=True)
+    names = [os.path.relpath(engine, engine_dir) for engine in engines]
+    return any("encoder" in name for name in names) and any("decoder" in name for name in names)
+
+
+def build_trt_engine(model_size: str, precision: str, engine_dir: str, example_dir: str) -> None:
+    """
+    Builds the TensorRT-LLM encoder/decoder engines with the whisper example's 
+    build.py. This is a one-time cost per (model, GPU, precision); later runs 
+    load the cached engines directly.
+
+    :param model_size: Model size (tiny, base, small, medium).
+    :param precision: Engine precision ('float16' or 'int8').
+    :param engine_dir: Output directory for the engines.
+    :param example_dir: Path to TensorRT-LLM's examples/whisper directory.
+    """
+    whisper = import_reference_whisper()
+
+    # build.py converts the original OpenAI checkpoint, so make sure it is downloaded
+    checkpoint_dir = os.path.join(TRT_CACHE_DIR, "checkpoints")
+    whisper.load_model(model_size, device="cpu", download_root=checkpoint_dir)
+
+    print(f"[INFO] Building TensorRT-LLM engine for '{model_size}' ({precision}). This happens only once...")
+    command = [
+        sys.executable, os.path.join(example_dir, "build.py"),
+        "--model_dir", checkpoint_dir,
+        "--model_name", model_size,
+        "--output_dir", engine_dir,
+        "--dtype", "float16",
+        "--use_gpt_attention_plugin", "--use_bert_attention_plugin", "--use_gemm_plugin",
+    ]
+    if precision == "int8":
+        command += ["--use_weight_only", "--weight_only_precision", "int8"]
+    try:
+        subprocess.run(command, check=True, cwd=example_dir, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     except subprocess.CalledProcessError as e:
         error_msg = e.stderr.decode("utf-8", errors="ignore")
-        print(f"[ERROR] Failed to extract audio: {error_msg}")
-        sys.exit(1)
+        raise RuntimeError(f"TensorRT-LLM engine build failed: {error_msg}")
+
+
+def load_trt(model_size: str, device: str, precision: str = "float16") -> Any:
+    """
+    Loads a TensorRT-LLM Whisper engine. The engine fuses attention, runs on 
+    fp16/int8 tensor cores, and captures the decoder as a CUDA graph. Engines 
+    are built lazily and cached on disk.
+
+    Uses the WhisperTRTLLM runner from TensorRT-LLM's examples/whisper, located 
+    via the TRTLLM_WHISPER_EXAMPLE_DIR environment variable.
+
+    :param model_size: Model size to load (tiny, base, small, medium).
+    :param device: Must be 'cuda'.
+    :param precision: Engine precision ('float16' or 'int8').
+    :return: A WhisperTRTLLM runner instance.
+    :raises RuntimeError: If TensorRT-LLM, the example runner, or the engine is unavailable.
+    """
+    if device != "cuda":
+        raise RuntimeError("TensorRT-LLM backend requires a CUDA device.")
+    try:
+        import tensorrt_llm  # noqa: F401
+    except ImportError:
+        raise RuntimeError("tensorrt_llm is not installed.")
+
+    example_dir = os.environ.get("TRTLLM_WHISPER_EXAMPLE_DIR")
+    engine_dir = trt_engine_dir(model_size, precision)
+    if not trt_engines_present(engine_dir):
+        if not example_dir or not os.path.isfile(os.path.join(example_dir, "build.py")):
+            raise RuntimeError(
+                f"No prebuilt engine in '{engine_dir}' and TRTLLM_WHISPER_EXAMPLE_DIR does not point "
+                "to TensorRT-LLM's examples/whisper directory, so it cannot be built."
+            )
+        build_trt_engine(model_size, precision, engine_dir, example_dir)
+        if not trt_engines_present(engine_dir):
+            raise RuntimeError(f"Engine build finished but no engines were found in '{engine_dir}'.")
+
+    if example_dir:
+        sys.path.insert(0, example_dir)
+    try:
+        from run import WhisperTRTLLM
+    except ImportError:
+        raise RuntimeError("Cannot import WhisperTRTLLM from TensorRT-LLM's examples/whisper/run.py.")
+
+    whisper = import_reference_whisper()
+    assets_dir = os.path.join(os.path.dirname(whisper.__file__), "assets")
+
+    print(f"[INFO] Loading TensorRT-LLM engine: {engine_dir}")
+    return WhisperTRTLLM(engine_dir, assets_dir=assets_dir)
+
+
+class OrtWhisper:
+    """
+    Greedy Whisper decoder on ONNX Runtime for models exported with sherpa-onnx's 
+    scripts/whisper/export-onnx.py. The encoder output (cross-attention K/V) and 
+    the self-attention KV cache live in device buffers allocated once and bound 
+    through IOBinding, so decoder steps never copy them between host and device.
+    """
 
+    def __init__(self, encoder_path: str, decoder_path: str, device: str):
+        """
+        Creates the inference sessions and the persistent device buffers.
 
-def transcribe_audio(audio_path: str, device: str, language: str, model_size: str) -> str:
+        :param encoder_path: Path to the exported encoder .onnx file.
+        :param decoder_path: Path to the exported decoder .onnx file.
+        :param device: 'cuda' or 'cpu'.
+        """
+        import onnxruntime as ort
+
+        providers = ["CUDAExecutionProvider"] if device == "cuda" else ["CPUExecutionProvider"]
+        self.encoder = ort.InferenceSession(encoder_path, providers=providers)
+        self.decoder = ort.InferenceSession(decoder_path, providers=providers)
+
+        meta = self.encoder.get_modelmeta().custom_metadata_map
+        self.n_mels = int(meta.get("n_mels", 80))
+        self.n_text_ctx = int(meta["n_text_ctx"])
+        n_text_layer = int(meta["n_text_layer"])
+        n_text_state = int(meta["n_text_state"])
+        n_audio_ctx = int(meta["n_audio_ctx"])
+
+        device_type = "cuda" if device == "cuda" else "cpu"
+
+        def allocate(shape: Tuple[int, ...], dtype: type) -> Any:
+            return ort.OrtValue.ortvalue_from_shape_and_type(shape, dtype, device_type, 0)
+
+        # Cross-attention K/V: written by the encoder, read by every decoder step
+        cross_shape = (n_text_layer, 1, n_audio_ctx, n_text_state)
+        self.cross_k = allocate(cross_shape, np.float32)
+        self.cross_v = allocate(cross_shape, np.float32)
+
+        # Self-attention KV cache, double-buffered: each step reads one pair and
+        # writes the other. Entries past the current offset are masked by the
+        # exported decoder, so the buffers need no clearing between windows.
+        self_shape = (n_text_layer, 1, self.n_text_ctx, n_text_state)
+        self.self_kv = [
+            (allocate(self_shape, np.float32), allocate(self_shape, np.float32)),
+            (allocate(self_shape, np.float32), allocate(self_shape, np.float32)),
+        ]
+        self.token = allocate((1, 1), np.int64)
+
+        self.encoder_io = self.encoder.io_binding()
+        self.encoder_io.bind_ortvalue_output("n_layer_cross_k", self.cross_k)
+        self.encoder_io.bind_ortvalue_output("n_layer_cross_v", self.cross_v)
+
+        # Logits are bound first (output 0) and to host memory, where argmax runs
+        self.decoder_io = self.decoder.io_binding()
+        self.decoder_io.bind_output("logits")
+        self.decoder_io.bind_ortvalue_input("n_layer_cross_k", self.cross_k)
+        self.decoder_io.bind_ortvalue_input("n_layer_cross_v", self.cross_v)
+
+    def decode_window(self, mel: np.ndarray, prompt: List[int], eot: int) -> List[int]:
+        """
+        Runs the encoder on one 30-second window and greedily decodes it.
+
+        :param mel: Log-mel spectrogram of shape (1, n_mels, 3000).
+        :param prompt: Start-of-transcript token sequence.
+        :param eot: End-of-transcript token id.
+        :return: The generated text tokens.
+        """
+        self.encoder_io.bind_cpu_input("mel", mel)
+        self.encoder.run_with_iobinding(self.encoder_io)
+
+        io = self.decoder_io
+        io.bind_cpu_input("tokens", np.array([prompt], dtype=np.int64))
+        offset = 0
+        n_tokens = len(prompt)
+        result = []
+        for step in range(self.n_text_ctx // 2):
+            (in_k, in_v), (out_k, out_v) = self.self_kv[step % 2], self.self_kv[(step + 1) % 2]
+            io.bind_ortvalue_input("in_n_layer_self_k_cache", in_k)
+            io.bind_ortvalue_input("in_n_layer_self_v_cache", in_v)
+            io.bind_ortvalue_output("out_n_layer_self_k_cache", out_k)
+            io.bind_ortvalue_output("out_n_layer_self_v_cache", out_v)
+            io.bind_cpu_input("offset", np.array([offset], dtype=np.int64))
+            self.decoder.run_with_iobinding(io)
+
+            token = int(io.get_outputs()[0].numpy()[0, -1].argmax())
+            if token == eot:
+                break
+            result.append(token)
+
+            offset += n_tokens
+            n_tokens = 1
+            self.token.update_inplace(np.array([[token]], dtype=np.int64))
+            io.bind_ortvalue_input("tokens", self.token)
+        return result
+
+    def transcribe(self, audio: np.ndarray, language: str) -> str:
+        """
+        Transcribes audio window by window.
+
+        :param audio: 16 kHz mono waveform, typically one chunk from stream_audio.
+        :param language: The language code (e.g., 'en', 'ru').
+        :return: The transcribed text as a string.
+        """
+        whisper = import_reference_whisper()
+        tokenizer = whisper.tokenizer.get_tokenizer(True, language=language, task="transcribe")
+        prompt = list(tokenizer.sot_sequence_including_notimestamps)
+        texts = []
+        for start in range(0, audio.shape[0], CHUNK_SAMPLES):
+            chunk = whisper.pad_or_trim(audio[start:start + CHUNK_SAMPLES])
+            mel = whisper.log_mel_spectrogram(chunk, self.n_mels).numpy()[np.newaxis]
+            tokens = self.decode_window(mel, prompt, tokenizer.eot)
+            texts.append(tokenizer.decode(tokens).strip())
+        return " ".join(text for text in texts if text)
+
+
+def load_ort(model_size: str, device: str) -> OrtWhisper:
+    """
+    Loads an exported ONNX Whisper model from ~/.cache/whisper-onnx/<model>/, 
+    which must contain the encoder and decoder produced by sherpa-onnx's 
+    export script (encoder.onnx/decoder.onnx or <model>-encoder.onnx/...).
+
+    :param model_size: Model size to load (tiny, base, small, medium).
+    :param device: 'cuda' or 'cpu'.
+    :return: An OrtWhisper instance.
+    :raises RuntimeError: If onnxruntime, the CUDA provider, or the model files are unavailable.
     """
-    Loads the specified Whisper model on the chosen device (CPU or GPU), 
-    then transcribes the audio file.
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        raise RuntimeError("onnxruntime is not installed.")
+    if device == "cuda" and "CUDAExecutionProvider" not in ort.get_available_providers():
+        raise RuntimeError("onnxruntime was installed without CUDA support (install onnxruntime-gpu).")
+
+    model_dir = os.path.join(ORT_CACHE_DIR, model_size)
+    paths = {}
+    for part in ("encoder", "decoder"):
+        candidates = [os.path.join(model_dir, f"{part}.onnx"), os.path.join(model_dir, f"{model_size}-{part}.onnx")]
+        paths[part] = next((path for path in candidates if os.path.isfile(path)), None)
+        if paths[part] is None:
+            raise RuntimeError(f"No exported {part} found in '{model_dir}'.")
+
+    print(f"[INFO] Loading ONNX Whisper model: {model_dir} on device: {device}")
+    return OrtWhisper(paths["encoder"], paths["decoder"], device)
+
 
-    :param audio_path: Path to the audio file to be transcribed.
+def load_model(backend: str, model_size: str, device: str, compute_type: Optional[str] = None,
+               compile: bool = False, quantize: str = "none", cuda_graph: bool = False) -> LoadedModel:
+    """
+    Loads the model for the selected backend. If the TensorRT-LLM backend is 
+    unavailable, falls back to the PyTorch backend; if the ONNX Runtime backend 
+    is unavailable, falls back to faster-whisper.
+
+    :param backend: 'faster' (faster-whisper), 'pytorch' (openai-whisper), 'trt' (TensorRT-LLM) 
+                    or 'ort' (ONNX Runtime).
+    :param model_size: Model size to load (tiny, base, small, medium).
     :param device: 'cuda' if GPU is available, otherwise 'cpu'.
+    :param compute_type: Compute type for faster-whisper; int8 variants also select 
+                         an int8 TensorRT-LLM engine. Ignored by the PyTorch backend.
+    :param compile: Whether to torch.compile the PyTorch backend's model.
+    :param quantize: bitsandbytes quantization of the PyTorch backend's model ('none', 'int8', 'int4').
+    :param cuda_graph: Whether to capture the PyTorch backend's encoder in a CUDA graph.
+    :return: The loaded model and the backend actually used.
+    """
+    if backend == "trt":
+        precision = "int8" if compute_type in ("int8", "int8_float16") else "float16"
+        try:
+            return LoadedModel("trt", device, load_trt(model_size, device, precision))
+        except RuntimeError as e:
+            print(f"[WARNING] TensorRT-LLM backend unavailable: {e} Falling back to PyTorch.")
+            backend = "pytorch"
+
+    if backend == "ort":
+        try:
+            return LoadedModel("ort", device, load_ort(model_size, device))
+        except RuntimeError as e:
+            print(f"[WARNING] ONNX Runtime backend unavailable: {e} Falling back to faster-whisper.")
+            backend = "faster"
+
+    if backend == "pytorch":
+        return LoadedModel("pytorch", device, load_pytorch(model_size, device, compile, quantize, cuda_graph))
+    return LoadedModel("faster", device, load_faster_whisper(model_size, device, compute_type))
+
+
+def get_cached_model(key: ModelKey) -> LoadedModel:
+    """
+    Returns the model for the given load_model arguments from the in-process 
+    cache, loading it on a miss. Least recently used models are evicted once 
+    a device holds MODEL_CACHE_SIZE models, so the model server keeps at most 
+    one model in VRAM.
+
+    :param key: Arguments for load_model.
+    :return: The loaded model.
+    """
+    if key in _MODEL_CACHE:
+        _MODEL_CACHE.move_to_end(key)
+        return _MODEL_CACHE[key]
+
+    device = key[2]
+    on_device = [cached for cached in _MODEL_CACHE if cached[2] == device]
+    for evicted in on_device[:max(0, len(on_device) - MODEL_CACHE_SIZE[device] + 1)]:
+        print(f"[INFO] Evicting cached model: {evicted[1]} ({evicted[0]}) on device: {device}")
+        del _MODEL_CACHE[evicted]
+    gc.collect()
+    if device == "cuda":
+        torch.cuda.empty_cache()
+
+    _MODEL_CACHE[key] = load_model(*key)
+    return _MODEL_CACHE[key]
+
+
+def transcribe_with_trt(model: Any, audio: np.ndarray, language: str) -> str:
+    """
+    Transcribes audio with a loaded TensorRT-LLM engine. The engine has a 
+    fixed 30-second input, so the audio is fed window by window.
+
+    :param model: A WhisperTRTLLM runner returned by load_trt.
+    :param audio: 16 kHz mono waveform, typically one chunk from stream_audio.
     :param language: The language code (e.g., 'en', 'ru').
-    :param model_size: Model size to load (tiny, base, small, medium).
     :return: The transcribed text as a string.
     """
-    # Load the model
-    print(f"[INFO] Loading Whisper model: {model_size} on device: {device}")
-    model = whisper.load_model(model_size, device=device)
+    whisper = import_reference_whisper()
+    text_prefix = f"<|startoftranscript|><|{language}|><|transcribe|><|notimestamps|>"
+    audio = torch.from_numpy(audio)
+    texts = []
+    for start in range(0, audio.shape[0], CHUNK_SAMPLES):
+        chunk = whisper.pad_or_trim(audio[start:start + CHUNK_SAMPLES])
+        mel = whisper.log_mel_spectrogram(chunk, device="cuda").type(torch.float16).unsqueeze(0)
+        texts.extend(model.process_batch(mel, text_prefix, num_beams=1))
+    return " ".join(text.strip() for text in texts)
+
+
+@functools.lru_cache(maxsize=None)
+def load_silero_vad() -> Optional[Tuple[Any, Any]]:
+    """
+    Loads the Silero VAD model from the silero-vad package, which ships the 
+    weights, so no network access or remote code is needed. Cached, so the 
+    model server loads it (or warns about it) only once.
+
+    :return: The silero_vad module and the VAD model, or None if unavailable.
+    """
+    print("[INFO] Loading Silero VAD...")
+    try:
+        import silero_vad
+        model = silero_vad.load_silero_vad()
+    except ImportError:
+        print("[WARNING] silero-vad is not installed (pip install silero-vad); transcribing without VAD.")
+        return None
+    except Exception as e:
+        print(f"[WARNING] Could not load Silero VAD ({type(e).__name__}: {e}); transcribing without VAD.")
+        return None
+    return silero_vad, model
+
+
+def remove_silence(audio: np.ndarray) -> np.ndarray:
+    """
+    Drops the silent parts of the audio with Silero VAD and stitches the 
+    speech regions together, so the decoder only runs where there is speech.
+
+    :param audio: 16 kHz mono waveform.
+    :return: The speech-only waveform (empty if there is no speech), or the 
+             audio unchanged if Silero VAD is unavailable.
+    """
+    vad = load_silero_vad()
+    if vad is None:
+        return audio
+    silero_vad, model = vad
+    waveform = torch.from_numpy(audio)
+    speech = silero_vad.get_speech_timestamps(
+        waveform, model, sampling_rate=SAMPLE_RATE, min_silence_duration_ms=VAD_MIN_SILENCE_MS
+    )
+    if not speech:
+        return audio[:0]
+    return silero_vad.collect_chunks(speech, waveform).numpy()
+
 
-    # Perform the transcription
+def transcribe_chunk(model: LoadedModel, audio: np.ndarray, language: str, vad: bool = True) -> str:
+    """
+    Transcribes one chunk of audio with an already loaded model. Chunks are 
+    transcribed independently (no conditioning on the previous chunk's text).
+
+    :param model: The model returned by load_model.
+    :param audio: 16 kHz mono waveform, typically one chunk from stream_audio.
+    :param language: The language code (e.g., 'en', 'ru').
+    :param vad: Whether to skip silence with voice activity detection.
+    :return: The transcribed text as a string.
+    """
+    # faster-whisper has Silero VAD built in; the other backends get a pre-pass
+    if vad and model.backend != "faster":
+        audio = remove_silence(audio)
+        if audio.size == 0:
+            return ""
+
+    if model.backend == "trt":
+        return transcribe_with_trt(model.model, audio, language)
+    if model.backend == "ort":
+        return model.model.transcribe(audio, language)
+    if model.backend == "pytorch":
+        if model.device == "cuda":
+            # whisper computes the log-mel on the waveform's device, so uploading
+            # it first runs the STFT and filterbank on the GPU
+            audio = torch.from_numpy(audio).to(model.device)
+        result = model.model.transcribe(
+            audio, language=language, fp16=(model.device == "cuda"),
+            condition_on_previous_text=False, verbose=False
+        )
+        return result["text"]
+
+    # faster-whisper generates segments lazily while iterating
+    segments, _ = model.model.transcribe(
+        audio, language=language, beam_size=1, condition_on_previous_text=False,
+        vad_filter=vad, vad_parameters=dict(min_silence_duration_ms=VAD_MIN_SILENCE_MS) if vad else None
+    )
+    return "".join(segment.text for segment in segments)
+
+
+def transcribe_one(model: LoadedModel, input_path: str, language: str, vad: bool = True) -> str:
+    """
+    Transcribes an audio or video file with an already loaded model. ffmpeg 
+    decodes in a background thread while the model transcribes the chunks 
+    already decoded.
+
+    :param model: The model returned by load_model.
+    :param input_path: Path to the audio or video file to be transcribed.
+    :param language: The language code (e.g., 'en', 'ru').
+    :param vad: Whether to skip silence with voice activity detection.
+    :return: The transcribed text as a string.
+    """
     print("[INFO] Starting transcription...")
-    result = model.transcribe(audio_path, language=language, verbose=False)
-    return result["text"]
+    chunks = prefetch(split_at_pauses(stream_audio(input_path)))
+    texts = [transcribe_chunk(model, chunk, language, vad) for chunk in chunks]
+    return " ".join(text.strip() for text in texts if text.strip())
+
+
+def daemon_socket_path() -> str:
+    """
+    Returns the Unix domain socket path of the model server. Uses the per-user 
+    $XDG_RUNTIME_DIR when set, otherwise a private per-user directory in the 
+    temp directory.
+
+    :return: Socket file path.
+    :raises PermissionError: If the per-user directory exists but is not private.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "whisper.sock")
+    name = f"whisper-{os.getuid()}" if hasattr(os, "getuid") else "whisper"
+    directory = ensure_private_dir(os.path.join(tempfile.gettempdir(), name))
+    return os.path.join(directory, "whisper.sock")
+
+
+def daemon_log_path() -> str:
+    """
+    Returns the log file of the model server, next to its socket.
+
+    :return: Log file path.
+    """
+    return os.path.join(os.path.dirname(daemon_socket_path()), "whisper-server.log")
+
+
+def daemon_available() -> bool:
+    """
+    Checks whether the model server can be used on this platform, and that its 
+    socket lives in a directory other users cannot access.
+
+    :return: True if the model server can be used.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    try:
+        daemon_socket_path()
+    except OSError as e:
+        print(f"[WARNING] Model server disabled: {e}")
+        return False
+    return True
 
 
-def valid_file_path(path: str) -> str:
+def connect_daemon() -> socket.socket:
     """
-    Checks if the provided file path is a valid file. Used by argparse 
-    for argument validation.
+    Connects to the running model server.
+
+    :return: A connected socket.
+    :raises OSError: If no server is listening (ConnectionRefusedError, FileNotFoundError).
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(daemon_socket_path())
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def start_daemon() -> Optional[socket.socket]:
+    """
+    Connects to the model server, starting it in the background if it is not 
+    running yet.
+
+    :return: A connected socket, or None if the server could not be started.
+    """
+    try:
+        return connect_daemon()
+    except OSError:
+        pass
+
+    print("[INFO] Starting background model server...")
+    log_path = daemon_log_path()
+    with open(log_path, "wb") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-u", os.path.abspath(__file__), "--serve"],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    while True:
+        try:
+            return connect_daemon()
+        except OSError:
+            # The server exits right away if it cannot run, e.g. without faster-whisper
+            if process.poll() is not None:
+                print(f"[WARNING] Model server exited during startup, see: {log_path}")
+                return None
+            if time.monotonic() > deadline:
+                print(f"[WARNING] Model server did not start within {DAEMON_START_TIMEOUT} seconds.")
+                return None
+            time.sleep(0.1)
+
+
+def transcribe_via_daemon(input_path: str, device: Optional[str], language: str, model_size: str,
+                          backend: str = "faster", compute_type: Optional[str] = None,
+                          compile: bool = False, quantize: str = "none", cuda_graph: bool = False,
+                          vad: bool = True) -> Optional[str]:
+    """
+    Transcribes the audio or video file through the background model server, 
+    which keeps models loaded between invocations and decodes the file itself.
+
+    :param input_path: Path to the audio or video file to be transcribed.
+    :param device: 'cpu' or 'cuda', or None to let the server auto-detect.
+    :param language: The language code (e.g., 'en', 'ru').
+    :param model_size: Model size to load (tiny, base, small, medium).
+    :param backend: 'faster' (faster-whisper), 'pytorch' (openai-whisper), 'trt' (TensorRT-LLM) 
+                    or 'ort' (ONNX Runtime).
+    :param compute_type: Compute type from --compute-type, or None for the per-device default.
+    :param compile: Whether to torch.compile the PyTorch backend's model.
+    :param quantize: bitsandbytes quantization of the PyTorch backend's model ('none', 'int8', 'int4').
+    :param cuda_graph: Whether to capture the PyTorch backend's encoder in a CUDA graph.
+    :param vad: Whether to skip silence with voice activity detection.
+    :return: The transcribed text as a string, or None if the server could not be started.
+    """
+    request = {
+        "path": os.path.abspath(input_path),
+        "lang": language,
+        "model_size": model_size,
+        "device": device,
+        "backend": backend,
+        "compute_type": compute_type,
+        "compile": compile,
+        "quantize": quantize,
+        "cuda_graph": cuda_graph,
+        "vad": vad,
+    }
+    print(f"[INFO] Transcribing with model server: {model_size} on device: {device or 'auto'}")
+    sock = start_daemon()
+    if sock is None:
+        return None
+    with sock:
+        try:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+        except OSError:
+            line = b""
+
+    if not line:
+        print("[ERROR] Model server closed the connection without a response.")
+        sys.exit(1)
+    response = json.loads(line)
+    # Fallbacks and downgrades the server ran into while loading or transcribing
+    for warning in response.get("warnings", []):
+        print(warning)
+    if "error" in response:
+        print(f"[ERROR] Model server failed: {response['error']}")
+        sys.exit(1)
+    if response["backend"] != backend:
+        # Also covers a fallback model the server loaded for an earlier call
+        print(f"[WARNING] Model server used the '{response['backend']}' backend instead of '{backend}'.")
+    return response["text"]
+
+
+def handle_daemon_request(conn: socket.socket) -> None:
+    """
+    Serves a single transcription request on an accepted connection, reusing 
+    models from the in-process model cache. Warnings printed while serving it 
+    are sent back to the client, along with the backend actually used.
+
+    :param conn: The accepted client connection.
+    """
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            with conn.makefile("rb") as reader:
+                request = json.loads(reader.readline())
+            device = resolve_device(request["device"])
+            key = (
+                request["backend"], request["model_size"], device, request.get("compute_type"),
+                request.get("compile", False), request.get("quantize", "none"), request.get("cuda_graph", False)
+            )
+            model = get_cached_model(key)
+            text = transcribe_one(model, request["path"], request["lang"], request.get("vad", True))
+        response = {"text": text, "backend": model.backend}
+    except TranscriptionError as e:
+        response = {"error": str(e)}
+    except SystemExit:
+        # The server must survive any helper that still exits on fatal errors
+        response = {"error": "transcription failed; rerun with --no-daemon for details."}
+    except Exception as e:
+        # Includes malformed requests (bad JSON, missing fields)
+        response = {"error": f"{type(e).__name__}: {e}"}
+
+    # Everything still goes to the server log
+    sys.stdout.write(output.getvalue())
+    response["warnings"] = [line for line in output.getvalue().splitlines() if line.startswith("[WARNING]")]
+
+    try:
+        conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
+    except OSError:
+        # The client went away; nothing to report to
+        pass
+
+
+def serve() -> None:
+    """
+    Runs the model server: listens on the Unix domain socket and answers 
+    transcription requests one at a time, keeping models warm between them. 
+    Exits after DAEMON_IDLE_TIMEOUT seconds without requests.
+    """
+    try:
+        path = daemon_socket_path()
+    except OSError as e:
+        print(f"[ERROR] Cannot create the model server socket: {e}")
+        sys.exit(1)
+
+    # Another server may already own the socket; a stale file is removed
+    try:
+        connect_daemon().close()
+        print(f"[INFO] Model server is already running at: {path}")
+        return
+    except (ConnectionRefusedError, FileNotFoundError):
+        if os.path.exists(path):
+            os.remove(path)
+
+    # Before binding: if the imports fail, no socket is left behind and no
+    # client is left waiting in the backlog
+    import_dependencies()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    os.chmod(path, 0o600)
+    server.listen()
+    server.settimeout(DAEMON_IDLE_TIMEOUT)
+    print(f"[INFO] Model server listening on: {path}")
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                print("[INFO] Model server idle, shutting down.")
+                break
+            with conn:
+                conn.settimeout(None)
+                handle_daemon_request(conn)
+    finally:
+        server.close()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def transcription_worker(rank: int, workers: int, gpu_count: int, jobs: Any, results: Any,
+                         model_key: ModelKey, language: str,
+                         vad: bool = True) -> None:
+    """
+    Worker process for --workers: loads its own model, then transcribes files 
+    from the shared job queue until it gets a None sentinel. On CUDA, worker N is pinned 
+    to GPU N modulo the GPU count; on CPU, the cores are split between workers.
+
+    :param rank: Worker index, passed by torch.multiprocessing.spawn.
+    :param workers: Total number of workers.
+    :param gpu_count: Number of visible GPUs (0 on CPU).
+    :param jobs: Queue of input file paths, followed by one None per worker.
+    :param results: Queue receiving (input_file, text, error) tuples.
+    :param model_key: Arguments for load_model.
+    :param language: The language code (e.g., 'en', 'ru').
+    :param vad: Whether to skip silence with voice activity detection.
+    """
+    global CPU_THREADS
+    # Must happen before CUDA initializes, so every backend sees its own GPU
+    # as the default one
+    if gpu_count:
+        os.environ["CUDA_VISIBLE_DEVICES"] = str(rank % gpu_count)
+    import_dependencies()
+    if not gpu_count:
+        # spawn has already imported torch here, so OMP_NUM_THREADS would come too late
+        CPU_THREADS = max(1, (os.cpu_count() or 1) // workers)
+        torch.set_num_threads(CPU_THREADS)
+    model = get_cached_model(model_key)
+
+    # A blocking get: get_nowait on a multiprocessing queue also raises Empty
+    # while another worker holds its read lock
+    while True:
+        input_file = jobs.get()
+        if input_file is None:
+            break
+        try:
+            print(f"[INFO] Worker {rank} decoding audio: {input_file}")
+            text = transcribe_one(model, input_file, language, vad)
+            results.put((input_file, text, None))
+        except TranscriptionError as e:
+            results.put((input_file, None, str(e)))
+        except SystemExit:
+            results.put((input_file, None, "transcription failed; see the messages above."))
+        except Exception as e:
+            results.put((input_file, None, f"{type(e).__name__}: {e}"))
+
+
+def default_worker_count(file_count: int, device: str) -> int:
+    """
+    Picks the worker count for --workers 0: one per GPU, or one per four CPU 
+    cores, never more than there are files.
+
+    :param file_count: Number of input files.
+    :param device: 'cuda' or 'cpu'.
+    :return: Number of worker processes.
+    """
+    if device == "cuda":
+        workers = torch.cuda.device_count()
+    else:
+        workers = (os.cpu_count() or 1) // 4
+    return max(1, min(file_count, workers))
+
+
+def transcribe_in_workers(input_files: List[str], workers: int,
+                          model_key: ModelKey,
+                          language: str, vad: bool = True) -> Iterator[Tuple[str, str]]:
+    """
+    Transcribes the files in parallel worker processes, each with its own 
+    model. Files are independent, so throughput scales with the number of 
+    GPUs (or CPU core groups).
+
+    :param input_files: Paths to the input files.
+    :param workers: Number of worker processes.
+    :param model_key: Arguments for load_model.
+    :param language: The language code (e.g., 'en', 'ru').
+    :param vad: Whether to skip silence with voice activity detection.
+    :return: (input_file, text) pairs in completion order.
+    """
+    import torch.multiprocessing as mp
+
+    device = model_key[2]
+    gpu_count = torch.cuda.device_count() if device == "cuda" else 0
+    print(f"[INFO] Starting {workers} workers on device: {device}")
+
+    context = mp.get_context("spawn")
+    jobs = context.Queue()
+    results = context.Queue()
+    for input_file in input_files:
+        jobs.put(input_file)
+    for _ in range(workers):
+        jobs.put(None)
+
+    processes = mp.spawn(
+        transcription_worker,
+        args=(workers, gpu_count, jobs, results, model_key, language, vad),
+        nprocs=workers,
+        join=False
+    )
+    try:
+        for _ in input_files:
+            while True:
+                try:
+                    input_file, text, error = results.get(timeout=1)
+                    break
+                except queue.Empty:
+                    pass
+                # Raises if a worker died, e.g. while loading its model
+                try:
+                    finished = processes.join(timeout=0)
+                except Exception as e:
+                    print(f"[ERROR] A worker process failed: {e}")
+                    sys.exit(1)
+                if finished:
+                    # Exited workers have flushed their results into the pipe,
+                    # so one more wait tells a late result from a missing one
+                    try:
+                        input_file, text, error = results.get(timeout=1)
+                        break
+                    except queue.Empty:
+                        print("[ERROR] Worker processes exited before transcribing every file.")
+                        sys.exit(1)
+            if error is not None:
+                print(f"[ERROR] Failed to transcribe '{input_file}': {error}")
+                sys.exit(1)
+            yield input_file, text
+        processes.join()
+    finally:
+        # spawn's processes are not daemonic: on an early exit, stop them
+        # instead of waiting for them to transcribe the remaining files
+        for process in processes.processes:
+            if process.is_alive():
+                process.terminate()
+
+
+@dataclass(frozen=True)
+class InputSpec:
+    """An input file validated by argparse, with its lowercased extension."""
+    path: str
+    suffix: str
+
+
+def valid_file_path(path: str) -> InputSpec:
+    """
+    Checks if the provided file path is a valid file in a supported format. 
+    Used by argparse for argument validation, so bad inputs are rejected 
+    before any heavy import or model load.
 
     :param path: File path string.
-    :return: The same path if valid, otherwise raises an exception.
+    :return: The path and its extension if valid, otherwise raises an exception.
     """
     if not os.path.isfile(path):
         raise argparse.ArgumentTypeError(f"File '{path}' does not exist.")
-    return path
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in AUDIO_EXTS and suffix not in VIDEO_EXTS:
+        raise argparse.ArgumentTypeError(
+            f"Unsupported file format: '{path}'. Supported formats: {', '.join(SUPPORTED_FORMATS)}."
+        )
+    return InputSpec(path=path, suffix=suffix)
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -123,11 +1560,13 @@ def parse_arguments() -> argparse.Namespace:
         )
     )
 
-    # Positional argument: input file
+    # Positional argument: input files (the model is loaded once for all of them)
     parser.add_argument(
-        "input_file",
+        "input_files",
         type=valid_file_path,
-        help="Path to the input file (audio/video). Supported formats: mp3, m4a, wav, mp4."
+        nargs="*",
+        metavar="input_file",
+        help=f"Path(s) to the input files (audio/video). Supported formats: {', '.join(SUPPORTED_FORMATS)}."
     )
 
     # Optional argument: output file
@@ -135,7 +1574,11 @@ def parse_arguments() -> argparse.Namespace:
         "-o", "--output",
         type=str,
         default=None,
-        help="Optional path to save the transcription text. If omitted, prints to console."
+        help=(
+            "Optional path to save the transcription text. If omitted, prints to console. "
+            "With several input files (or an existing directory), this is a directory that "
+            "receives one .txt file per input."
+        )
     )
 
     # Optional argument: language selection
@@ -168,69 +1611,283 @@ def parse_arguments() -> argparse.Namespace:
         help="Force device to 'cpu' or 'cuda'. By default, auto-detects GPU if available."
     )
 
-    return parser.parse_args()
+    # Optional argument: inference backend
+    parser.add_argument(
+        "-b", "--backend",
+        type=str,
+        choices=["pytorch", "faster", "trt", "ort"],
+        default="faster",
+        help=(
+            "Inference backend: 'faster' (faster-whisper), 'pytorch' (reference openai-whisper), "
+            "'trt' (TensorRT-LLM engine, CUDA only) or 'ort' (exported ONNX model on ONNX Runtime). "
+            "Default is 'faster'."
+        )
+    )
+
+    # Optional argument: compute type
+    parser.add_argument(
+        "-c", "--compute-type",
+        type=str,
+        choices=["float16", "int8", "int8_float16", "float32"],
+        default=None,
+        help=(
+            "Compute type for the faster-whisper backend. By default, 'int8' on CPU, "
+            "'int8_float16' on GPUs with tensor cores and 'float16' on older GPUs."
+        )
+    )
+
+    # Optional argument: disable voice activity detection
+    parser.add_argument(
+        "--no-vad",
+        action="store_true",
+        help=(
+            "Transcribe silent parts too. By default, Silero VAD drops silence "
+            "(pauses of 500 ms or more) before decoding."
+        )
+    )
+
+    # Optional argument: parallel workers
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes for multiple input files, each with its own model "
+            "(one per GPU, round-robin). 0 picks one per GPU, or one per four CPU cores. Default is 1."
+        )
+    )
+
+    # Optional argument: torch.compile the PyTorch model
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help=(
+            "Compile the PyTorch backend's model with torch.compile. The first run pays a "
+            "~30 s warmup; compiled kernels are cached in ~/.cache/whisper_inductor."
+        )
+    )
+
+    # Optional argument: quantize the PyTorch model
+    parser.add_argument(
+        "-q", "--quantize",
+        type=str,
+        choices=["none", "int8", "int4"],
+        default="none",
+        help=(
+            "Quantize the PyTorch backend's linear layers with bitsandbytes (CUDA only): "
+            "'int8' halves and 'int4' (NF4) quarters weight memory, at some accuracy cost. "
+            "Default is 'none'."
+        )
+    )
+
+    # Optional argument: CUDA graph for the PyTorch encoder
+    parser.add_argument(
+        "--cuda-graph",
+        action="store_true",
+        help=(
+            "Capture the PyTorch backend's encoder in a CUDA graph for its fixed 30-second input, "
+            "removing per-kernel launch overhead (CUDA only)."
+        )
+    )
+
+    # Optional argument: prepack a model for fast loading
+    parser.add_argument(
+        "--prepack",
+        type=str,
+        choices=["tiny", "base", "small", "medium"],
+        default=None,
+        metavar="MODEL",
+        help=(
+            "Convert the given model's checkpoint to an fp16 safetensors file in "
+            "~/.cache/whisper-prepacked, which the PyTorch backend then memory-maps on load."
+        )
+    )
+
+    # Optional argument: run the background model server
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help=(
+            "Run the background model server that keeps models loaded between calls. "
+            "Started automatically on first use; exits after 15 idle minutes."
+        )
+    )
+
+    # Optional argument: bypass the background model server
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Load the model in this process instead of using the background model server."
+    )
+
+    args = parser.parse_args()
+    if not args.input_files and not args.serve and args.prepack is None:
+        parser.error("the following arguments are required: input_file")
+    if args.workers < 0:
+        parser.error("argument -w/--workers: must be 0 or a positive number")
+
+    # With several inputs, --output is a directory of per-file transcripts named
+    # after the inputs; reject what would fail or overwrite only after transcribing
+    if args.output is not None and (len(args.input_files) > 1 or os.path.isdir(args.output)):
+        if os.path.exists(args.output) and not os.path.isdir(args.output):
+            parser.error(f"argument -o/--output: '{args.output}' is a file, but several input files need a directory")
+        sources = {}
+        for spec in args.input_files:
+            output_file = output_path_for(spec.path, args.output, True)
+            key = os.path.normcase(output_file)
+            if key in sources:
+                parser.error(
+                    f"argument -o/--output: '{sources[key]}' and '{spec.path}' would both be saved to '{output_file}'"
+                )
+            sources[key] = spec.path
+    return args
+
+
+def output_path_for(input_file: str, output: Optional[str], output_is_dir: bool) -> Optional[str]:
+    """
+    Derives where the transcription of an input file is saved.
+
+    :param input_file: Path to the input file.
+    :param output: The --output argument (file, directory, or None).
+    :param output_is_dir: Whether --output names a directory.
+    :return: The output file path, or None to print to console.
+    """
+    if output is None or not output_is_dir:
+        return output
+    name, _ = os.path.splitext(os.path.basename(input_file))
+    return os.path.join(output, name + ".txt")
+
+
+def model_key_from_args(args: argparse.Namespace, device: str) -> ModelKey:
+    """
+    Collects the load_model arguments from the parsed command line.
+
+    :param args: Parsed command-line arguments.
+    :param device: The resolved device ('cuda' or 'cpu').
+    :return: Arguments for load_model.
+    """
+    return (args.backend, args.model, device, args.compute_type, args.compile, args.quantize, args.cuda_graph)
+
+
+def load_local_model(args: argparse.Namespace) -> LoadedModel:
+    """
+    Loads the model in this process instead of using the model server.
+
+    :param args: Parsed command-line arguments (model and backend options).
+    :return: The loaded model.
+    """
+    import_dependencies()
+    device = resolve_device(args.device)
+    return get_cached_model(model_key_from_args(args, device))
+
+
+def transcribe_sequentially(input_specs: List[InputSpec], language: str,
+                            args: argparse.Namespace) -> Iterator[Tuple[str, str]]:
+    """
+    Transcribes the files one after another, preferably through the warm 
+    background model server, otherwise with a model loaded once in this 
+    process. Only the process that loads the model imports PyTorch and 
+    detects the device.
+
+    :param input_specs: The validated input files.
+    :param language: The language code (e.g., 'en', 'ru').
+    :param args: Parsed command-line arguments (model and backend options).
+    :return: (input_file, text) pairs in input order.
+    """
+    if args.no_daemon or not daemon_available():
+        model = load_local_model(args)
+    else:
+        model = None
+
+    for spec in input_specs:
+        transcribed_text = None
+        if model is None:
+            transcribed_text = transcribe_via_daemon(
+                input_path=spec.path, 
+                device=args.device, 
+                language=language, 
+                model_size=args.model,
+                backend=args.backend,
+                compute_type=args.compute_type,
+                compile=args.compile,
+                quantize=args.quantize,
+                cuda_graph=args.cuda_graph,
+                vad=not args.no_vad
+            )
+            if transcribed_text is None:
+                # The in-process load reports what stopped the server (e.g. a missing package)
+                print("[WARNING] Model server unavailable, loading the model in this process.")
+                model = load_local_model(args)
+        if transcribed_text is None:
+            # Audio and video alike are decoded straight into memory
+            if spec.suffix in VIDEO_EXTS:
+                print(f"[INFO] Detected video file. Extracting audio from: {spec.path}")
+            else:
+                print(f"[INFO] Decoding audio: {spec.path}")
+            transcribed_text = transcribe_one(model, spec.path, language, not args.no_vad)
+        yield spec.path, transcribed_text
 
 
 def main() -> None:
     """
     Main function that orchestrates the console application flow:
     1. Parse CLI arguments.
-    2. Validate file extension.
-    3. Extract audio if needed.
-    4. Transcribe using the chosen Whisper model.
-    5. Save or print the result.
+    2. Validate files and their formats (during argument parsing).
+    3. Load the chosen Whisper model once (or reuse the model server), or 
+       start parallel workers that each load one.
+    4. For each input file, decode its audio and transcribe it.
+    5. Save or print the results.
     """
     args = parse_arguments()
+    if args.serve:
+        serve()
+        return
+    if args.prepack is not None:
+        import_dependencies()
+        prepack_model(args.prepack)
+        return
 
     # Map short language codes to Whisper-compatible codes
     language_map = {"eng": "en", "rus": "ru"}
     language = language_map[args.lang]
 
-    # Determine the device
-    if args.device is not None:
-        device = args.device
-    else:
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-
-    input_file = args.input_file
-    output_file = args.output
-    model_size = args.model
-
-    _, ext = os.path.splitext(input_file)
-    ext = ext.lower()
-
-    audio_path = input_file  # If already an audio file
-
-    # If it's a video file, extract audio first
-    if ext == ".mp4":
-        print("[INFO] Detected video file. Extracting audio...")
-        audio_path = "temp_audio.wav"
-        extract_audio(input_file, audio_path)
-    elif ext not in [".mp3", ".m4a", ".wav"]:
-        print("[ERROR] Unsupported file format. Please provide mp3, mp4, m4a, or wav.")
-        sys.exit(1)
-
-    # Transcribe
-    transcribed_text = transcribe_audio(
-        audio_path=audio_path, 
-        device=device, 
-        language=language, 
-        model_size=model_size
-    )
+    # Paths and formats were validated by argparse, before any model load
+    input_specs = args.input_files
+    input_files = [spec.path for spec in input_specs]
+    output = args.output
 
-    # Clean up temporary audio file if we extracted from video
-    if ext == ".mp4" and os.path.exists(audio_path):
-        os.remove(audio_path)
+    output_is_dir = output is not None and (len(input_files) > 1 or os.path.isdir(output))
+    if output_is_dir:
+        os.makedirs(output, exist_ok=True)
 
-    # Output handling
-    if output_file:
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(transcribed_text)
-        print(f"\n[INFO] Transcription saved to: {output_file}")
+    # Several files can be spread over worker processes, each loading its own model
+    if args.workers != 1 and len(input_files) > 1:
+        import_dependencies()
+        device = resolve_device(args.device)
+        model_key = model_key_from_args(args, device)
+        workers = args.workers or default_worker_count(len(input_files), device)
+        results = transcribe_in_workers(
+            input_files, min(workers, len(input_files)), model_key, language, not args.no_vad
+        )
     else:
-        print("\n[TRANSCRIPTION OUTPUT]")
-        print(transcribed_text)
+        results = transcribe_sequentially(input_specs, language, args)
+
+    for input_file, transcribed_text in results:
+        # Output handling
+        output_file = output_path_for(input_file, output, output_is_dir)
+        if output_file:
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(transcribed_text)
+            print(f"\n[INFO] Transcription saved to: {output_file}")
+        else:
+            header = "[TRANSCRIPTION OUTPUT]" if len(input_files) == 1 else f"[TRANSCRIPTION OUTPUT] {input_file}"
+            print(f"\n{header}")
+            print(transcribed_text)
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except TranscriptionError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)